@@ -3,118 +3,184 @@ const { spawn } = require('child_process');
 const path = require('path');
 const fs = require('fs');
 
+// Use python3 or python depending on the system, unless overridden
+const pythonCommand = process.env.PYTHON_EXECUTABLE
+  || (process.platform === 'win32' ? 'python' : 'python3');
+const pythonScript = path.join(__dirname, 'extract_text.py');
+
+// Persistent Python worker. Spawning a fresh interpreter per request pays the
+// Python startup plus boto3/pptx/pytesseract import cost (~500 ms) every
+// time; instead we keep one long-lived process that reads JSON requests from
+// stdin and writes one JSON response per line to stdout.
+let worker = null;
+let workerBuffer = '';
+let nextRequestId = 1;
+const pendingRequests = new Map(); // id -> { resolve, reject }
+
+function failAllPending(err) {
+  for (const { reject } of pendingRequests.values()) {
+    reject(err);
+  }
+  pendingRequests.clear();
+}
+
+// A stray stdout write (an unparseable line, or a response id nothing is
+// waiting on) means the protocol framing is broken: any in-flight request
+// could be wedged forever, so reject them all and kill the worker - the next
+// request respawns a clean one.
+function abandonWorker(proc, err) {
+  console.error('Python worker protocol failure, restarting worker:', err.message);
+  if (worker === proc) {
+    worker = null;
+  }
+  // Mark so this proc's close event doesn't reject requests that by then
+  // belong to a replacement worker
+  proc.abandoned = true;
+  failAllPending(err);
+  proc.kill();
+}
+
+function getWorker() {
+  if (worker) {
+    return worker;
+  }
+
+  if (!fs.existsSync(pythonScript)) {
+    throw new Error(`Python script not found: ${pythonScript}`);
+  }
+
+  console.log('Starting persistent Python extract_text.py worker');
+  const proc = spawn(pythonCommand, [pythonScript, '--serve']);
+  worker = proc;
+  workerBuffer = '';
+
+  proc.stdout.on('data', (data) => {
+    workerBuffer += data.toString();
+
+    // Responses are newline-delimited JSON; dispatch each complete line
+    let newlineIndex;
+    while ((newlineIndex = workerBuffer.indexOf('\n')) !== -1) {
+      const line = workerBuffer.slice(0, newlineIndex).trim();
+      workerBuffer = workerBuffer.slice(newlineIndex + 1);
+      if (!line) continue;
+
+      let response;
+      try {
+        response = JSON.parse(line);
+      } catch (err) {
+        abandonWorker(proc, new Error(`Unparseable Python worker output: ${line}`));
+        return;
+      }
+
+      const pending = pendingRequests.get(response.id);
+      if (!pending) {
+        abandonWorker(proc, new Error(`Python worker response for unknown request id ${response.id}`));
+        return;
+      }
+      pendingRequests.delete(response.id);
+
+      if (response.error) {
+        pending.reject(new Error(response.error));
+      } else {
+        pending.resolve(response.data);
+      }
+    }
+  });
+
+  proc.stderr.on('data', (data) => {
+    console.error(`Python stderr: ${data}`);
+  });
+
+  proc.on('close', (code) => {
+    console.error(`Python worker exited with code ${code}`);
+    if (proc.abandoned) return;
+    if (worker === proc) {
+      worker = null;
+    }
+    failAllPending(new Error(`Python worker exited with code ${code}`));
+  });
+
+  proc.on('error', (err) => {
+    console.error('Failed to start Python worker:', err);
+    if (proc.abandoned) return;
+    if (worker === proc) {
+      worker = null;
+    }
+    failAllPending(new Error(`Failed to start Python worker: ${err.message}`));
+  });
+
+  return proc;
+}
+
+function sendRequest(payload) {
+  return new Promise((resolve, reject) => {
+    let proc;
+    try {
+      proc = getWorker();
+    } catch (err) {
+      return reject(err);
+    }
+
+    const id = nextRequestId++;
+    pendingRequests.set(id, { resolve, reject });
+    proc.stdin.write(JSON.stringify({ id, ...payload }) + '\n');
+  });
+}
+
 /**
- * Executes the Python script to extract text from a PowerPoint file or count slides
- * @param {string} filePath - Path to the PowerPoint file
+ * Asks the persistent Python worker to extract text from a PowerPoint file or count slides
+ * @param {string} filePath - Path to the PowerPoint file, or an S3 key
  * @param {boolean} countOnly - If true, only count slides without extracting text
  * @returns {Promise<Object>} - Result object containing extracted text data or slide count
  */
-function extractText(filePath, countOnly = false) {
-  return new Promise((resolve, reject) => {
-    // Check if the file exists
-    if (!fs.existsSync(filePath)) {
-      return reject(new Error(`File does not exist: ${filePath}`));
-    }
-    
-    console.log(`Executing Python extract_text.py for file: ${filePath} (count only: ${countOnly})`);
-    
-    // Use the Python script in the same directory
-    const pythonScript = path.join(__dirname, 'extract_text.py');
-    
-    // Check if Python script exists
-    if (!fs.existsSync(pythonScript)) {
-      return reject(new Error(`Python script not found: ${pythonScript}`));
+async function extractText(filePath, countOnly = false) {
+  // The worker resolves the path itself: local files are read directly,
+  // anything else is treated as an S3 key
+  if (!fs.existsSync(filePath)) {
+    console.log(`Path does not exist locally, passing to Python as an S3 key: ${filePath}`);
+  }
+
+  console.log(`Requesting Python extraction for: ${filePath} (count only: ${countOnly})`);
+
+  const result = await sendRequest({ path: filePath, count_only: countOnly });
+
+  if (result && result.error) {
+    throw new Error(result.error);
+  }
+
+  // Format the result based on countOnly mode
+  if (countOnly) {
+    if (result && result.slideCount !== undefined) {
+      return result;
     }
-    
-    // Prepare arguments
-    const args = [pythonScript, filePath];
-    if (countOnly) {
-      args.push('count_only');
+    // If no explicit slide count, try to infer from data length
+    if (Array.isArray(result)) {
+      return { slideCount: result.length };
     }
-    
-    // Use python3 or python depending on the system
-    const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
-    
-    // Spawn python process
-    const pythonProcess = spawn(pythonCommand, args);
-    
-    let scriptOutput = '';
-    let scriptError = '';
-    
-    // Collect data from script
-    pythonProcess.stdout.on('data', (data) => {
-      scriptOutput += data.toString();
-    });
-    
-    pythonProcess.stderr.on('data', (data) => {
-      scriptError += data.toString();
-      console.error(`Python stderr: ${data}`);
-    });
-    
-    // Handle process completion
-    pythonProcess.on('close', (code) => {
-      console.log(`Python process exited with code ${code}`);
-      
-      if (code !== 0) {
-        console.error(`Python extract_text.py error: ${scriptError}`);
-        return reject(new Error(`Python process exited with code ${code}: ${scriptError}`));
-      }
-      
-      // Parse the output
-      try {
-        const result = JSON.parse(scriptOutput);
-        
-        if (result.error) {
-          return reject(new Error(result.error));
-        }
-        
-        // Format the result based on countOnly mode
-        if (countOnly) {
-          if (result.data && result.data.slideCount !== undefined) {
-            return resolve(result.data);
-          } else {
-            // If no explicit slide count, try to infer from data length
-            if (Array.isArray(result.data)) {
-              return resolve({ slideCount: result.data.length });
-            } else {
-              return reject(new Error('Could not determine slide count from Python output'));
-            }
-          }
-        } else {
-          return resolve(result.data);
-        }
-      } catch (err) {
-        console.error('Error parsing Python output:', err);
-        return reject(new Error(`Failed to parse Python output: ${err.message}`));
-      }
-    });
-    
-    pythonProcess.on('error', (err) => {
-      console.error('Failed to start Python process:', err);
-      reject(new Error(`Failed to start Python process: ${err.message}`));
-    });
-  });
+    throw new Error('Could not determine slide count from Python output');
+  }
+
+  return result;
 }
 
 // Simple test function to verify Python execution
 async function testPythonExecution() {
   try {
     // Try to execute a simple Python command
-    const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
     const testProcess = spawn(pythonCommand, ['-c', 'print("Python is working")']);
-    
+
     return new Promise((resolve, reject) => {
       let output = '';
       let error = '';
-      
+
       testProcess.stdout.on('data', (data) => {
         output += data.toString();
       });
-      
+
       testProcess.stderr.on('data', (data) => {
         error += data.toString();
       });
-      
+
       testProcess.on('close', (code) => {
         if (code === 0) {
           resolve(true);
@@ -122,7 +188,7 @@ async function testPythonExecution() {
           reject(new Error(`Python test failed with code ${code}: ${error}`));
         }
       });
-      
+
       testProcess.on('error', (err) => {
         reject(new Error(`Failed to start Python test: ${err.message}`));
       });
@@ -140,4 +206,4 @@ testPythonExecution()
 
 module.exports = {
   extractText
-};
\ No newline at end of file
+};
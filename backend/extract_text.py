@@ -1,34 +1,190 @@
 # backend/extract_text.py
-import sys, os, boto3, io, json
-from pptx import Presentation
-from pptx.enum.shapes import MSO_SHAPE_TYPE
-from PIL import Image
-import pytesseract
+import sys, os, io, json, hashlib, threading, zipfile, functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
 
+# boto3, python-pptx, PIL and pytesseract together cost ~400 ms at import but
+# are only needed on the paths that use them - count-only and error-path
+# requests should not pay for any of it. They are imported on first use;
+# Python caches modules, so repeat calls only pay a dict lookup.
+Image = None
+ImageStat = None
+pytesseract = None
+
+def _import_ocr_deps():
+    """Import PIL and pytesseract on first use and configure Tesseract once."""
+    global Image, ImageStat, pytesseract
+    if Image is None:
+        from PIL import Image as _Image, ImageStat as _ImageStat
+        import pytesseract as _pytesseract
+        Image = _Image
+        ImageStat = _ImageStat
+        pytesseract = _pytesseract
+        configure_tesseract()
+        _import_optional_deps()
+
+# Optional accelerators, resolved together with the OCR deps: probing them at
+# module scope costs ~200 ms when installed (numba alone is ~140 ms, and
+# imagehash drags PIL back in), which count-only and error-path requests
+# should not pay.
+imagehash = None
+tesserocr = None
+np = None
+_PHASH_COS = None
+_phash_bits = None
+_OPTIONAL_DEPS_PROBED = False
+
+def _import_optional_deps():
+    """Probe the optional accelerators once, tolerating any that are missing."""
+    global _OPTIONAL_DEPS_PROBED, imagehash, tesserocr, np, _PHASH_COS, _phash_bits
+    if _OPTIONAL_DEPS_PROBED:
+        return
+    _OPTIONAL_DEPS_PROBED = True
+
+    try:
+        import imagehash as _imagehash  # near-duplicate detection
+        imagehash = _imagehash
+    except ImportError:
+        pass
+
+    try:
+        import tesserocr as _tesserocr  # keeps the Tesseract model resident in-process
+        tesserocr = _tesserocr
+    except ImportError:
+        pass
+
+    try:
+        import numpy as _np  # native-speed pHash for the dedup cache
+    except ImportError:
+        return
+    np = _np
+
+    # Cosine basis for the low-frequency 8x8 block of a 32x32 2D DCT-II
+    _PHASH_COS = np.cos((np.pi / 64.0) * np.outer(np.arange(8), 2 * np.arange(32) + 1))
+
+    def phash_bits(pixels):
+        """DCT-based 64-bit perceptual hash of a 32x32 grayscale float array."""
+        dct = _PHASH_COS @ pixels @ _PHASH_COS.T
+        med = np.median(dct.flatten())
+        bits = np.uint64(0)
+        one = np.uint64(1)
+        for u in range(8):
+            for v in range(8):
+                bits = bits << one
+                if dct[u, v] > med:
+                    bits |= one
+        return bits
+
+    try:
+        from numba import njit  # JIT-compiles the pHash kernel
+        # nogil lets threaded callers hash concurrently; cache avoids
+        # recompiling the kernel on every process start
+        phash_bits = njit(cache=True, nogil=True)(phash_bits)
+    except ImportError:
+        pass
+    _phash_bits = phash_bits
+
 load_dotenv()
 
-# Set Tesseract CMD path - check PATH first, then try default location
-if os.name == 'nt':  # Windows
-    import shutil
-    
-    # Try to find tesseract in PATH first
-    tesseract_path = shutil.which('tesseract')
-    if tesseract_path:
-        print(f"Found Tesseract in PATH: {tesseract_path}", file=sys.stderr)
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-    else:
-        # Fall back to default location
-        default_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-        if os.path.exists(default_path):
-            print(f"Using default Tesseract path: {default_path}", file=sys.stderr)
-            pytesseract.pytesseract.tesseract_cmd = default_path
+# OCR result caches. Corporate decks reuse logos, headers and stock images
+# across slides; hashing an image is a few ms while OCR is 50-260 ms, so
+# repeated images should skip Tesseract entirely. Scoped to a single run:
+# extraction clears both per presentation, so results never leak between
+# requests in the long-lived worker and the pHash scan stays bounded.
+_OCR_CACHE = {}    # md5(image_bytes).digest() -> OCR text (exact duplicates)
+_PHASH_CACHE = []  # (64-bit pHash, OCR text) pairs (near-duplicates)
+_PHASH_MAX_DISTANCE = 3
+
+# Pre-OCR gates: images smaller or flatter than these cannot hold readable
+# text, and oversized ones are downscaled before the Tesseract pass.
+_MIN_OCR_WIDTH = 60
+_MIN_OCR_HEIGHT = 20
+_MIN_OCR_STDDEV = 8
+_MAX_OCR_EDGE = 2000
+
+# In-process Tesseract APIs (tesserocr). Each pytesseract call forks a
+# tesseract subprocess and reloads the language model; tesserocr pays that
+# cost once per OCR thread. The API object is not thread-safe, so each
+# thread lazily creates its own instance.
+_TESS_LOCAL = threading.local()
+_TESS_FAILED = False
+
+def _get_tesseract_api():
+    """Return this thread's tesserocr API, or None to fall back to pytesseract."""
+    global _TESS_FAILED
+    _import_optional_deps()
+    if tesserocr is None or _TESS_FAILED:
+        return None
+    api = getattr(_TESS_LOCAL, 'api', None)
+    if api is None:
+        try:
+            api = tesserocr.PyTessBaseAPI(
+                psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.DEFAULT)
+        except Exception as e:
+            print(f"tesserocr unavailable, falling back to pytesseract: {e}", file=sys.stderr)
+            _TESS_FAILED = True
+            return None
+        _TESS_LOCAL.api = api
+    return api
+
+def _phash64(image_bytes):
+    """Return a 64-bit perceptual hash of the image, or None if unavailable."""
+    try:
+        _import_ocr_deps()
+        if _phash_bits is not None:
+            image = Image.open(io.BytesIO(image_bytes)).convert('L').resize((32, 32), Image.BILINEAR)
+            return int(_phash_bits(np.asarray(image, dtype=np.float64)))
+        if imagehash is not None:
+            return int(str(imagehash.phash(Image.open(io.BytesIO(image_bytes)))), 16)
+    except Exception:
+        pass
+    return None
+
+def _cached_ocr(md5_digest, phash):
+    """Look up previously OCR'd text for an identical or near-identical image."""
+    if md5_digest in _OCR_CACHE:
+        return _OCR_CACHE[md5_digest]
+    if phash is not None:
+        for cached_phash, text in _PHASH_CACHE:
+            if bin(phash ^ cached_phash).count('1') <= _PHASH_MAX_DISTANCE:
+                return text
+    return None
+
+def _store_ocr(md5_digest, phash, text):
+    """Remember an OCR result so later copies of the same image are free."""
+    _OCR_CACHE[md5_digest] = text
+    if phash is not None:
+        _PHASH_CACHE.append((phash, text))
+
+def configure_tesseract():
+    """Set Tesseract CMD path - check PATH first, then try default location."""
+    if os.name == 'nt':  # Windows
+        import shutil
+
+        # Try to find tesseract in PATH first
+        tesseract_path = shutil.which('tesseract')
+        if tesseract_path:
+            print(f"Found Tesseract in PATH: {tesseract_path}", file=sys.stderr)
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
         else:
-            print("WARNING: Tesseract not found in PATH or default location. OCR will not work.", file=sys.stderr)
+            # Fall back to default location
+            default_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+            if os.path.exists(default_path):
+                print(f"Using default Tesseract path: {default_path}", file=sys.stderr)
+                pytesseract.pytesseract.tesseract_cmd = default_path
+            else:
+                print("WARNING: Tesseract not found in PATH or default location. OCR will not work.", file=sys.stderr)
 
+@functools.lru_cache(maxsize=1)
 def check_tesseract():
-    """Verify Tesseract installation and configuration."""
+    """Verify Tesseract installation and configuration.
+
+    The probe runs a real OCR pass (~100 ms), and the configuration is
+    process-global, so the result is cached for the process lifetime - one
+    check instead of one per presentation, which matters in worker mode.
+    """
     try:
+        _import_ocr_deps()
         # Try a simple OCR operation to verify Tesseract works
         test_image = Image.new('RGB', (100, 30), color='white')
         pytesseract.image_to_string(test_image)
@@ -37,23 +193,96 @@ def check_tesseract():
         print(json.dumps({"error": f"Tesseract not properly configured: {str(e)}. Please ensure Tesseract is installed."}), file=sys.stderr)
         return False
 
+def _prepare_image(image_bytes):
+    """Decode and pre-process image bytes for OCR.
+
+    Returns a grayscale PIL image ready for Tesseract, or None when the image
+    fails the cheap pre-OCR gates (too small or too flat to contain readable
+    text).
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+
+    # Too small to contain readable text (decorative bullets, tiny icons)
+    if image.width < _MIN_OCR_WIDTH or image.height < _MIN_OCR_HEIGHT:
+        print(f"Skipping OCR: image too small ({image.width}x{image.height})", file=sys.stderr)
+        return None
+
+    # Convert images with transparency to RGB (Tesseract prefers RGB).
+    # getchannel decodes only the alpha plane, unlike split() which
+    # decodes every band.
+    bands = image.getbands()
+    if 'A' in bands:
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+        bands = image.getbands()
+
+    # Attempt to improve image quality for OCR
+    if bands != ('L',):
+        image = image.convert('L')  # Convert to grayscale
+
+    # Near-uniform images (solid fills, gradients, plain logos) cannot
+    # contain readable text - skip the 50+ ms Tesseract call for them
+    if ImageStat.Stat(image).stddev[0] < _MIN_OCR_STDDEV:
+        print("Skipping OCR: low-contrast image", file=sys.stderr)
+        return None
+
+    # Very large images only slow Tesseract down without improving
+    # recognition - cap the longest edge
+    if max(image.width, image.height) > _MAX_OCR_EDGE:
+        image.thumbnail((_MAX_OCR_EDGE, _MAX_OCR_EDGE), Image.BILINEAR)
+
+    return image
+
+# Set when piping to Tesseract over stdin fails once, so every later call
+# goes straight to pytesseract instead of retrying a broken pipe path.
+_STDIN_OCR_FAILED = False
+
+def _ocr_via_stdin(image):
+    """Pipe a PNG-encoded image to Tesseract over stdin.
+
+    pytesseract writes a temp file to disk and has the subprocess re-read it
+    on every call; piping the bytes directly skips that I/O roundtrip. The
+    PNG is encoded once with fast compression - the bytes go straight into a
+    pipe, so size does not matter. Returns the OCR text, or None if the pipe
+    path is unavailable (callers fall back to pytesseract).
+    """
+    global _STDIN_OCR_FAILED
+    import subprocess
+
+    if _STDIN_OCR_FAILED:
+        return None
+    try:
+        buf = io.BytesIO()
+        image.save(buf, 'PNG', optimize=False, compress_level=1)
+        result = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, 'stdin', 'stdout', '--oem', '3', '--psm', '6'],
+            input=buf.getvalue(), capture_output=True, check=True)
+        return result.stdout.decode('utf-8', errors='replace')
+    except Exception as e:
+        print(f"stdin OCR failed, falling back to pytesseract: {e}", file=sys.stderr)
+        _STDIN_OCR_FAILED = True
+        return None
+
 def perform_ocr(image_bytes):
     """Performs OCR on image bytes and returns extracted text."""
     try:
-        image = Image.open(io.BytesIO(image_bytes))
-        
-        # Convert RGBA to RGB if needed (Tesseract prefers RGB)
-        if image.mode == 'RGBA':
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            background.paste(image, mask=image.split()[3])
-            image = background
-        
-        # Attempt to improve image quality for OCR
-        image = image.convert('L')  # Convert to grayscale
-        
+        _import_ocr_deps()
+        image = _prepare_image(image_bytes)
+        if image is None:
+            return ""
+
         # Run OCR with specific configuration for better results
-        custom_config = r'--oem 3 --psm 6'  # Page segmentation mode 6: Assume uniform block of text
-        text = pytesseract.image_to_string(image, config=custom_config)
+        api = _get_tesseract_api()
+        if api is not None:
+            # Persistent in-process worker: no subprocess fork, no model reload
+            api.SetImage(image)
+            text = api.GetUTF8Text()
+        else:
+            text = _ocr_via_stdin(image)
+            if text is None:
+                custom_config = r'--oem 3 --psm 6'  # Page segmentation mode 6: Assume uniform block of text
+                text = pytesseract.image_to_string(image, config=custom_config)
         extracted = text.strip()
         
         if extracted:
@@ -66,11 +295,74 @@ def perform_ocr(image_bytes):
         print(f"OCR Error: {e}", file=sys.stderr)
         return ""
 
+# Reused S3 client (creation costs ~100 ms) and transfer settings that enable
+# parallel range-GETs for large decks instead of a single-threaded download.
+_S3_CLIENT = None
+_S3_TRANSFER_CONFIG = None
+
+def _batch_ocr(image_blobs):
+    """OCR many images with a single Tesseract invocation via a file list.
+
+    Spawning Tesseract per image reloads the LSTM model every time; the CLI
+    also accepts a text file listing image paths and emits one form-feed
+    separated page per image, amortizing the model load across the whole
+    deck. Returns a list of texts aligned with image_blobs, or None if batch
+    mode failed (callers fall back to per-image OCR).
+    """
+    import subprocess, tempfile
+
+    try:
+        _import_ocr_deps()
+        texts = [""] * len(image_blobs)
+        with tempfile.TemporaryDirectory(prefix="pptx_ocr_") as tmpdir:
+            paths = []
+            kept = []  # indexes of images that passed the pre-OCR gates
+            for idx, blob in enumerate(image_blobs):
+                image = _prepare_image(blob)
+                if image is None:
+                    continue
+                path = os.path.join(tmpdir, f"img_{idx}.png")
+                image.save(path, 'PNG')
+                paths.append(path)
+                kept.append(idx)
+
+            if not kept:
+                return texts
+
+            list_path = os.path.join(tmpdir, "imglist.txt")
+            with open(list_path, 'w') as f:
+                f.write("\n".join(paths))
+
+            result = subprocess.run(
+                [pytesseract.pytesseract.tesseract_cmd, list_path, 'stdout', '--oem', '3', '--psm', '6'],
+                capture_output=True, text=True, check=True)
+
+        pages = result.stdout.split('\f')
+        if len(pages) < len(kept):
+            print(f"Batch OCR page mismatch: {len(pages)} pages for {len(kept)} images", file=sys.stderr)
+            return None
+        for idx, page in zip(kept, pages):
+            texts[idx] = page.strip()
+        return texts
+    except Exception as e:
+        print(f"Batch OCR failed, falling back to per-image OCR: {e}", file=sys.stderr)
+        return None
+
 def download_from_s3(bucket_name, s3_key):
+    global _S3_CLIENT, _S3_TRANSFER_CONFIG
     try:
-        s3 = boto3.client('s3')
+        if _S3_CLIENT is None:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            _S3_CLIENT = boto3.client('s3')
+            _S3_TRANSFER_CONFIG = TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=10,
+                use_threads=True,
+            )
         buf = io.BytesIO()
-        s3.download_fileobj(bucket_name, s3_key, buf)
+        _S3_CLIENT.download_fileobj(bucket_name, s3_key, buf, Config=_S3_TRANSFER_CONFIG)
         buf.seek(0)
         return buf
     except Exception as e:
@@ -90,8 +382,15 @@ def count_slides(file_path_or_buffer):
                 return 0
             print(f"File exists at {file_path_or_buffer}, size: {os.path.getsize(file_path_or_buffer)} bytes", file=sys.stderr)
         
-        prs = Presentation(file_path_or_buffer)
-        slide_count = len(prs.slides)
+        # A PPTX is a ZIP; the slide count is the number of
+        # ppt/slides/slideN.xml entries. Listing the archive directory is an
+        # order of magnitude cheaper than a full Presentation() load, which
+        # parses every slide, relationship and master layout.
+        with zipfile.ZipFile(file_path_or_buffer) as z:
+            slide_count = sum(1 for name in z.namelist()
+                              if name.startswith('ppt/slides/slide') and name.endswith('.xml'))
+        if hasattr(file_path_or_buffer, 'seek'):
+            file_path_or_buffer.seek(0)
         print(f"Successfully counted {slide_count} slides", file=sys.stderr)
         return slide_count
     except Exception as e:
@@ -100,6 +399,48 @@ def count_slides(file_path_or_buffer):
         traceback.print_exc(file=sys.stderr)
         return 0  # Return 0 instead of exiting to handle errors better
 
+# Slide XML namespaces for _extract_slide_texts
+_PPTX_NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+}
+
+# Decks below this size are parsed serially; worker startup and XML pickling
+# would cost more than the parse itself
+_PARALLEL_SLIDE_THRESHOLD = 16
+
+def _extract_slide_texts(slide_xml):
+    """Extract the per-shape text of one slide from its raw XML part.
+
+    Takes bytes rather than a python-pptx object so the parse can run in a
+    worker process - slide parts are independent and lxml trees are not
+    shareable across processes. Mirrors shape.text: runs concatenated, soft
+    line breaks (a:br) rendered as '\\v', paragraphs joined with newlines,
+    one entry per non-empty text body.
+    """
+    from lxml import etree
+
+    a_t = '{%s}t' % _PPTX_NS['a']
+    a_br = '{%s}br' % _PPTX_NS['a']
+    texts = []
+    root = etree.fromstring(slide_xml)
+    for body in root.iter('{%s}txBody' % _PPTX_NS['p']):
+        paragraphs = []
+        for para in body.findall('a:p', _PPTX_NS):
+            pieces = []
+            # Walk in document order so a line break keeps separating the
+            # runs around it instead of letting them run together
+            for node in para.iter(a_t, a_br):
+                if node.tag == a_br:
+                    pieces.append('\v')
+                elif node.text:
+                    pieces.append(node.text)
+            paragraphs.append(''.join(pieces))
+        text = '\n'.join(paragraphs).strip()
+        if text:
+            texts.append(text)
+    return texts
+
 def extract_text_from_presentation(file_buffer, count_only=False):
     """Extract text and/or count slides from a PowerPoint presentation.
     
@@ -121,48 +462,158 @@ def extract_text_from_presentation(file_buffer, count_only=False):
         if not count_only and not check_tesseract():
             return data
 
+        # Deferred so count-only and error-path requests never load python-pptx
+        from pptx import Presentation
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+
         prs = Presentation(file_buffer)
         if not prs.slides: return data
 
+        # First pass: collect what needs the package object - image blobs for
+        # OCR, notes, and each slide's raw XML part. Text parsing and OCR are
+        # both dispatched to pools afterwards instead of running serially
+        # inside this loop.
+        slides_info = []  # per-slide dicts built up across the passes
+        ocr_jobs = []     # (slide_idx, image_index, image_blob)
+        slide_blobs = []  # raw slide XML, one entry per slide
         for i, slide in enumerate(prs.slides):
             slide_num = i + 1
-            slide_texts = []
             notes_text = None
             image_count = 0
-            ocr_count = 0
 
-            for shape in slide.shapes:
-                if shape.has_text_frame and shape.text.strip():
-                    slide_texts.append(shape.text.strip())
-                elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            slide_blobs.append(slide.part.blob)
+
+            # Materialize the lazy XML walk once and bind shape_type to a
+            # local; pictures are the only shapes that still need the package
+            # relationships (text comes from the raw XML below).
+            shapes = list(slide.shapes)
+            for shape in shapes:
+                st = shape.shape_type
+                if st == MSO_SHAPE_TYPE.PICTURE:
                     image_count += 1
                     try:
-                        image_bytes = shape.image.blob
-                        ocr_text = perform_ocr(image_bytes)
-                        if ocr_text:
-                            ocr_count += 1
-                            slide_texts.append(f"[OCR Text: {ocr_text}]")
-                            print(f"Slide {slide_num}: OCR successful for image {image_count}", file=sys.stderr)
+                        ocr_jobs.append((i, image_count, shape.image.blob))
                     except Exception as img_err:
                         print(f"Error processing image {image_count} on slide {slide_num}: {img_err}", file=sys.stderr)
 
-            if slide.has_notes_slide and slide.notes_slide.notes_text_frame:
-                notes_text = slide.notes_slide.notes_text_frame.text.strip()
+            if slide.has_notes_slide:
+                # notes_slide lazily loads the notes XML part; touch it once
+                # and only strip when there is actually text
+                notes_frame = slide.notes_slide.notes_text_frame
+                if notes_frame is not None:
+                    notes_raw = notes_frame.text
+                    notes_text = notes_raw.strip() or None
 
-            # Include OCR statistics in the slide data
-            slide_data = {
+            slides_info.append({
                 "slide": slide_num,
-                "text": " ".join(slide_texts),
+                "texts": [],
                 "notes": notes_text,
+                "image_count": image_count,
+                "ocr_count": 0,
+            })
+
+        # Slide text: each XML part is self-contained, so large decks parse
+        # across worker processes; small ones stay serial because worker
+        # startup would cost more than the parse.
+        if len(slide_blobs) >= _PARALLEL_SLIDE_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    all_texts = list(executor.map(_extract_slide_texts, slide_blobs, chunksize=8))
+            except Exception as e:
+                print(f"Parallel slide parsing failed, falling back to serial: {e}", file=sys.stderr)
+                all_texts = [_extract_slide_texts(blob) for blob in slide_blobs]
+        else:
+            all_texts = [_extract_slide_texts(blob) for blob in slide_blobs]
+        for info, texts in zip(slides_info, all_texts):
+            info["texts"] = texts
+
+        # Second pass: OCR all queued images. Tesseract dominates the
+        # runtime, so unique images are batched or fanned out to a pool
+        # rather than processed serially.
+        if ocr_jobs:
+            # The caches are per-presentation: a Hamming-close hit against an
+            # earlier request's deck could splice another user's OCR text
+            # into this result, and _PHASH_CACHE would otherwise grow (and be
+            # linearly scanned) forever in the long-lived worker.
+            _OCR_CACHE.clear()
+            _PHASH_CACHE.clear()
+
+            # Deduplicate before dispatch: exact duplicates by MD5, near
+            # duplicates (recompressed logos/headers) by pHash - including
+            # against images already queued this run. Only unique images are
+            # sent to Tesseract.
+            ocr_results = [None] * len(ocr_jobs)
+            pending = {}          # md5 digest -> [phash, blob, [job indexes]]
+            pending_phashes = []  # (phash, md5 digest) of queued images
+            for job_idx, (_, _, blob) in enumerate(ocr_jobs):
+                digest = hashlib.md5(blob).digest()
+                if digest in pending:
+                    pending[digest][2].append(job_idx)
+                    continue
+                phash = _phash64(blob)
+                cached = _cached_ocr(digest, phash)
+                if cached is not None:
+                    ocr_results[job_idx] = cached
+                    continue
+                # Near-identical to an image already queued (the same logo
+                # re-encoded at a different quality)? Share its OCR result.
+                near_dup = None
+                if phash is not None:
+                    for queued_phash, queued_digest in pending_phashes:
+                        if bin(phash ^ queued_phash).count('1') <= _PHASH_MAX_DISTANCE:
+                            near_dup = queued_digest
+                            break
+                if near_dup is not None:
+                    pending[near_dup][2].append(job_idx)
+                else:
+                    pending[digest] = [phash, blob, [job_idx]]
+                    if phash is not None:
+                        pending_phashes.append((phash, digest))
+
+            if pending:
+                unique = list(pending.items())
+                blobs = [entry[1] for _, entry in unique]
+                # Without tesserocr every OCR call spawns its own tesseract
+                # process; batch them through one CLI invocation to pay the
+                # model load once. With tesserocr (or if batching fails) use
+                # the per-image path in the process pool.
+                unique_texts = None
+                if tesserocr is None and len(blobs) > 1:
+                    unique_texts = _batch_ocr(blobs)
+                if unique_texts is None:
+                    # Threads, not processes: the real work happens outside
+                    # the GIL (tesserocr C calls or the tesseract subprocess
+                    # wait), and 1-5 MB image blobs never get pickled.
+                    workers = min(8, (os.cpu_count() or 4) * 2)
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        unique_texts = list(executor.map(perform_ocr, blobs))
+                for (digest, (phash, _, job_idxs)), text in zip(unique, unique_texts):
+                    _store_ocr(digest, phash, text)
+                    for job_idx in job_idxs:
+                        ocr_results[job_idx] = text
+
+            for (slide_idx, image_index, _), ocr_text in zip(ocr_jobs, ocr_results):
+                if ocr_text:
+                    info = slides_info[slide_idx]
+                    info["ocr_count"] += 1
+                    info["texts"].append(f"[OCR Text: {ocr_text}]")
+                    print(f"Slide {info['slide']}: OCR successful for image {image_index}", file=sys.stderr)
+
+        for info in slides_info:
+            # Include OCR statistics in the slide data
+            slide_data = {
+                "slide": info["slide"],
+                "text": " ".join(info["texts"]),
+                "notes": info["notes"],
                 "stats": {
-                    "total_images": image_count,
-                    "ocr_successful": ocr_count
+                    "total_images": info["image_count"],
+                    "ocr_successful": info["ocr_count"]
                 }
             }
             data.append(slide_data)
-            
+
             # Log slide processing summary
-            print(f"Processed slide {slide_num}: {image_count} images, {ocr_count} OCR successes", file=sys.stderr)
+            print(f"Processed slide {info['slide']}: {info['image_count']} images, {info['ocr_count']} OCR successes", file=sys.stderr)
 
         return data
     except Exception as e:
@@ -180,30 +631,69 @@ def extractText(file_path, count_only=False):
         print(f"Error in extractText: {e}", file=sys.stderr)
         return {"error": str(e)}
 
+def process_request(input_path, count_only=False):
+    """Run the extraction pipeline for a local file path or an S3 key."""
+    if os.path.isfile(input_path):
+        # It's a local file
+        print(f"Processing local file: {input_path}", file=sys.stderr)
+        return extract_text_from_presentation(input_path, count_only)
+
+    # Assume it's an S3 key
+    print(f"Processing S3 key: {input_path}", file=sys.stderr)
+    bucket_name = os.getenv("S3_BUCKET_NAME")
+    if not bucket_name:
+        raise RuntimeError("S3_BUCKET_NAME environment variable not set")
+
+    presentation_buffer = download_from_s3(bucket_name, input_path)
+    return extract_text_from_presentation(presentation_buffer, count_only)
+
+def serve_forever():
+    """Persistent worker mode for the Node.js integration.
+
+    Reads one JSON request per line from stdin ({"id", "path", "count_only"})
+    and writes one JSON response per line to stdout ({"id", "data"} or
+    {"id", "error"}). The path may be a local file or an S3 key, exactly like
+    the one-shot CLI. Keeping the process alive means the interpreter,
+    boto3/pptx imports and the Tesseract check are paid once instead of on
+    every request.
+    """
+    print("extract_text.py worker ready", file=sys.stderr)
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        req_id = None
+        try:
+            req = json.loads(line)
+            req_id = req.get('id')
+            result = process_request(req['path'], req.get('count_only', False))
+            response = {"id": req_id, "data": result}
+        except SystemExit:
+            # e.g. a failed S3 download; the worker itself must stay alive
+            response = {"id": req_id, "error": "request failed, see stderr"}
+        except Exception as e:
+            response = {"id": req_id, "error": str(e)}
+        sys.stdout.write(json.dumps(response) + '\n')
+        sys.stdout.flush()
+
 if __name__ == "__main__":
     # Handle both direct file paths and S3 keys
     if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: python extract_text.py <file_path_or_s3_key> [count_only]"}))
+        print(json.dumps({"error": "Usage: python extract_text.py <file_path_or_s3_key|--serve> [count_only]"}))
         sys.exit(1)
 
+    if sys.argv[1] == '--serve':
+        serve_forever()
+        sys.exit(0)
+
     input_path = sys.argv[1]
     count_only = len(sys.argv) > 2 and sys.argv[2].lower() == 'count_only'
-    
-    # Determine if it's a file path or S3 key
-    if os.path.isfile(input_path):
-        # It's a local file
-        print(f"Processing local file: {input_path}", file=sys.stderr)
-        result = extract_text_from_presentation(input_path, count_only)
-    else:
-        # Assume it's an S3 key
-        print(f"Processing S3 key: {input_path}", file=sys.stderr)
-        bucket_name = os.getenv("S3_BUCKET_NAME")
-        if not bucket_name:
-            print(json.dumps({"error": "S3_BUCKET_NAME environment variable not set"}))
-            sys.exit(1)
-        
-        presentation_buffer = download_from_s3(bucket_name, input_path)
-        result = extract_text_from_presentation(presentation_buffer, count_only)
-    
+
+    try:
+        result = process_request(input_path, count_only)
+    except RuntimeError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
     # Output the result
     print(json.dumps({"data": result}))
\ No newline at end of file
@@ -5,7 +5,7 @@ const cors = require('cors');
 const multer = require('multer');
 const path = require('path');
 const fs = require('fs');
-const { spawn } = require('child_process');
+const { extractText } = require('./extract_text');
 const { S3Client, PutObjectCommand, GetObjectCommand } = require("@aws-sdk/client-s3");
 const { getSignedUrl } = require("@aws-sdk/s3-request-presigner");
 const { GoogleGenerativeAI } = require("@google/generative-ai");
@@ -112,33 +112,10 @@ async function uploadToS3(localFilePath, s3Key, contentType) {
 }
 
 function runTextExtraction(s3Key) {
-    return new Promise((resolve, reject) => {
-        const pythonExecutable = process.env.PYTHON_EXECUTABLE || 'python';
-        console.log(`Executing: ${pythonExecutable} extract_text.py ${s3Key}`);
-        const pythonProcess = spawn(pythonExecutable, ['extract_text.py', s3Key], { cwd: __dirname });
-        let scriptOutput = ""; let scriptError = "";
-
-        pythonProcess.stdout.on('data', (data) => { scriptOutput += data.toString(); });
-        pythonProcess.stderr.on('data', (data) => { scriptError += data.toString(); });
-
-        pythonProcess.on('close', (code) => {
-            console.log(`Python script exited with code ${code}`);
-            if (code === 0) {
-                try {
-                    const result = JSON.parse(scriptOutput);
-                    if (result.error) { reject(new Error(`Extraction script error: ${result.error}`)); }
-                    else { resolve(result.data); }
-                } catch (e) { reject(new Error(`Failed to parse extraction script output: ${e.message}\nOutput: ${scriptOutput}`)); }
-            } else {
-                 try {
-                    const errJson = JSON.parse(scriptError);
-                    if (errJson.error) { reject(new Error(`Extraction script failed: ${errJson.error}`)); return; }
-                 } catch(e) { /* Ignore */ }
-                reject(new Error(`Python script failed (code ${code}). Stderr: ${scriptError || 'None'}. Stdout: ${scriptOutput || 'None'}`));
-            }
-        });
-        pythonProcess.on('error', (error) => reject(new Error(`Failed to start extraction script: ${error.message}`)));
-    });
+    // The persistent Python worker resolves the S3 key itself (download,
+    // parse, OCR), so no interpreter is spawned per request
+    console.log(`Requesting extraction from the Python worker for: ${s3Key}`);
+    return extractText(s3Key);
 }
 
 async function analyzeWithGemini(extractedSlides) {
@@ -939,28 +916,13 @@ app.post('/api/analysis/validate-slides', authMiddleware, (req, res) => {
     console.log(`Validating slide count for ${req.file.originalname} at ${localFilePath}`);
 
     try {
-      // Execute Python script to count slides only
-      const pythonExecutable = process.env.PYTHON_EXECUTABLE || 'python';
-      console.log(`Executing Python extract_text.py for file: ${localFilePath} (count only: true)`);
-      
-      const pythonProcess = spawn(pythonExecutable, ['extract_text.py', localFilePath, 'count_only'], { cwd: __dirname });
-      
-      let scriptOutput = "";
-      let scriptError = "";
-      
-      pythonProcess.stdout.on('data', (data) => {
-        scriptOutput += data.toString();
-      });
-      
-      pythonProcess.stderr.on('data', (data) => {
-        scriptError += data.toString();
-        // We'll still log stderr, as it might contain debugging info
-        console.log("Python stderr:", scriptError);
-      });
+      // Ask the persistent Python worker to count slides only
+      console.log(`Requesting slide count from the Python worker for: ${localFilePath}`);
 
-      pythonProcess.on('close', async (code) => {
-        console.log(`Python process exited with code ${code}`);
-        
+      let result;
+      try {
+        result = await extractText(localFilePath, true);
+      } finally {
         // Clean up the uploaded file regardless of outcome
         try {
           if (fs.existsSync(localFilePath)) {
@@ -969,68 +931,24 @@ app.post('/api/analysis/validate-slides', authMiddleware, (req, res) => {
         } catch (cleanupErr) {
           console.warn(`Non-critical: Failed to delete temp file ${localFilePath}:`, cleanupErr);
         }
-        
-        if (code === 0) {
-          try {
-            // Parse the JSON output from Python
-            const result = JSON.parse(scriptOutput);
-            
-            if (result.error) {
-              return res.status(400).json({ 
-                error: true, 
-                message: `Slide validation failed: ${result.error}` 
-              });
-            }
-            
-            if (!result.data || typeof result.data.slideCount !== 'number') {
-              return res.status(400).json({ 
-                error: true, 
-                message: 'Invalid response format from slide validation'
-              });
-            }
-            
-            const slideCount = result.data.slideCount;
-            console.log(`Slide count for ${req.file.originalname}: ${slideCount}`);
-            
-            // Return success response
-            return res.status(200).json({
-              error: false,
-              slideCount: slideCount,
-              message: `Slide validation complete. File has ${slideCount} slides.`
-            });
-          } catch (e) {
-            console.error("Failed to parse Python script output:", e, "\nOutput was:", scriptOutput);
-            return res.status(500).json({ 
-              error: true, 
-              message: `Failed to parse validation result: ${e.message}`
-            });
-          }
-        } else {
-          console.error(`Python script failed with code ${code}. Stderr: ${scriptError}`);
-          return res.status(500).json({ 
-            error: true, 
-            message: 'Failed to validate slides. Python script error.'
-          });
-        }
-      });
-      
-      pythonProcess.on('error', (error) => {
-        console.error(`Failed to start Python process: ${error.message}`);
-        // Clean up the uploaded file
-        try {
-          if (fs.existsSync(localFilePath)) {
-            fs.unlinkSync(localFilePath);
-          }
-        } catch (cleanupErr) {
-          console.warn(`Non-critical: Failed to delete temp file ${localFilePath}:`, cleanupErr);
-        }
-        
-        return res.status(500).json({ 
-          error: true, 
-          message: `Failed to start slide validation process: ${error.message}` 
+      }
+
+      if (!result || typeof result.slideCount !== 'number') {
+        return res.status(400).json({
+          error: true,
+          message: 'Invalid response format from slide validation'
         });
+      }
+
+      const slideCount = result.slideCount;
+      console.log(`Slide count for ${req.file.originalname}: ${slideCount}`);
+
+      // Return success response
+      return res.status(200).json({
+        error: false,
+        slideCount: slideCount,
+        message: `Slide validation complete. File has ${slideCount} slides.`
       });
-      
     } catch (error) {
       console.error(`Slide validation failed:`, error);
       // Clean up the uploaded file